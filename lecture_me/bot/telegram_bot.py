@@ -1,12 +1,14 @@
 import logging
 import random
+import time
 from typing import Dict
 
 from telegram import ReplyKeyboardMarkup, ReplyKeyboardRemove, Update
 from telegram.ext import (Application, CommandHandler, ContextTypes,
                           MessageHandler, filters)
 
-from lecture_me.models.data_models import Question, UserSession
+from lecture_me.models.data_models import AnswerEvent, Question, UserSession
+from lecture_me.services.history_service import HistoryService
 from lecture_me.services.llm_service import LLMService
 from lecture_me.services.notes_service import NotesService
 
@@ -19,11 +21,16 @@ logger = logging.getLogger(__name__)
 
 class TelegramBot:
     def __init__(
-        self, token: str, notes_service: NotesService, llm_service: LLMService
+        self,
+        token: str,
+        notes_service: NotesService,
+        llm_service: LLMService,
+        history_service: HistoryService,
     ):
         self.token = token
         self.notes_service = notes_service
         self.llm_service = llm_service
+        self.history_service = history_service
         self.user_sessions: Dict[int, UserSession] = {}
 
     def get_user_session(self, user_id: int) -> UserSession:
@@ -67,7 +74,7 @@ class TelegramBot:
         session = self.get_user_session(user_id)
 
         # Get available subjects
-        subjects = self.notes_service.get_subjects()
+        subjects = await self.notes_service.get_subjects()
 
         if not subjects:
             await update.message.reply_text(
@@ -100,19 +107,45 @@ class TelegramBot:
         user_id = update.effective_user.id
         session = self.get_user_session(user_id)
 
-        if session.questions_answered == 0:
+        # All-time statistics precomputed by the analytics script
+        summary = await self.history_service.get_user_summary(user_id)
+
+        if session.questions_answered == 0 and not summary:
             await update.message.reply_text(
                 "You haven't answered any questions yet! Use /study to start learning."
             )
-        else:
+            return
+
+        stats_blocks = []
+        if session.questions_answered > 0:
             average_score = session.score / session.questions_answered
-            await update.message.reply_text(
+            stats_blocks.append(
                 f"📊 Your Study Statistics:\n"
                 f"Questions answered: {session.questions_answered}\n"
                 f"Total score: {session.score}\n"
                 f"Average score: {average_score:.1f}/3"
             )
 
+        if summary:
+            summary_text = (
+                f"🗂 All-time: {summary['questions_answered']} questions, "
+                f"average score: {summary['average_score']:.1f}/3"
+            )
+            hardest_topics = sorted(
+                summary["topics"].items(),
+                key=lambda item: item[1]["difficulty"],
+                reverse=True,
+            )[:3]
+            if hardest_topics:
+                summary_text += "\nHardest topics:"
+                for topic_key, topic_summary in hardest_topics:
+                    summary_text += (
+                        f"\n- {topic_key}: {topic_summary['average_score']:.1f}/3"
+                    )
+            stats_blocks.append(summary_text)
+
+        await update.message.reply_text("\n\n".join(stats_blocks))
+
     async def handle_message(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
@@ -154,7 +187,7 @@ class TelegramBot:
         session = self.get_user_session(user_id)
 
         # Verify subject exists
-        subjects = self.notes_service.get_subjects()
+        subjects = await self.notes_service.get_subjects()
         subject_names = [s.name for s in subjects]
 
         if subject_name not in subject_names:
@@ -169,7 +202,7 @@ class TelegramBot:
         session.selected_subject = subject_name
 
         # Get topics for this subject
-        topics = self.notes_service.get_topics_for_subject(subject_name)
+        topics = await self.notes_service.get_topics_for_subject(subject_name)
 
         if not topics:
             await update.message.reply_text(
@@ -205,12 +238,16 @@ class TelegramBot:
 
         # Handle random topic selection
         if topic_name == "🎲 Random Topic":
-            topics = self.notes_service.get_topics_for_subject(session.selected_subject)
+            topics = await self.notes_service.get_topics_for_subject(
+                session.selected_subject
+            )
             if topics:
                 topic_name = random.choice(topics).name
 
         # Verify topic exists
-        topics = self.notes_service.get_topics_for_subject(session.selected_subject)
+        topics = await self.notes_service.get_topics_for_subject(
+            session.selected_subject
+        )
         topic_names = [t.name for t in topics]
 
         if topic_name not in topic_names:
@@ -241,7 +278,7 @@ class TelegramBot:
         assert session.selected_subject is not None, "Subject name must be provided"
         assert session.selected_topic is not None, "Topic name must be provided"
 
-        paragraph = self.notes_service.get_random_paragraph(
+        paragraph = await self.notes_service.get_random_paragraph(
             session.selected_subject, session.selected_topic
         )
 
@@ -258,9 +295,16 @@ class TelegramBot:
             chat_id=update.effective_chat.id, action="typing"
         )
 
+        # Ask the question in the language of the user
+        locale = self.llm_service.prompt_registry.resolve_locale(
+            update.effective_user.language_code
+        )
+
         # Generate question using LLM
         try:
-            question_text = await self.llm_service.generate_question(paragraph)
+            start_time = time.monotonic()
+            question_text = await self.llm_service.generate_question(paragraph, locale)
+            generation_latency = time.monotonic() - start_time
         except Exception as e:
             logger.error(f"Error generating question: {e}")
             await update.message.reply_text(
@@ -275,6 +319,9 @@ class TelegramBot:
             source_paragraph=paragraph,
             topic=session.selected_topic,
             subject=session.selected_subject,
+            locale=locale,
+            asked_at=time.time(),
+            generation_latency=generation_latency,
         )
 
         session.current_question = question
@@ -306,6 +353,8 @@ class TelegramBot:
             )
             return
 
+        answer_latency = time.time() - session.current_question.asked_at
+
         # Show typing indicator
         await context.bot.send_chat_action(
             chat_id=update.effective_chat.id, action="typing"
@@ -313,11 +362,14 @@ class TelegramBot:
 
         # Score the answer using LLM
         try:
+            start_time = time.monotonic()
             score, feedback = await self.llm_service.score_answer(
                 session.current_question.text,
                 user_answer,
                 session.current_question.source_paragraph,
+                session.current_question.locale,
             )
+            scoring_latency = time.monotonic() - start_time
         except Exception as e:
             logger.error(f"Error scoring answer: {e}")
             await update.message.reply_text(
@@ -330,6 +382,25 @@ class TelegramBot:
         session.score += score
         session.questions_answered += 1
 
+        # Log the event for offline analytics (does not wait for the write)
+        question = session.current_question
+        self.history_service.record(
+            AnswerEvent(
+                user_id=user_id,
+                locale=question.locale,
+                subject=question.subject,
+                topic=question.topic,
+                file_path=str(question.source_paragraph.file_path),
+                paragraph_index=question.source_paragraph.paragraph_index,
+                question=question.text,
+                score=score,
+                timestamp=time.time(),
+                generation_latency=question.generation_latency,
+                answer_latency=answer_latency,
+                scoring_latency=scoring_latency,
+            )
+        )
+
         # Determine score emoji
         score_emoji = {0: "❌", 1: "🔶", 2: "✅", 3: "🌟"}
 
@@ -378,7 +449,7 @@ class TelegramBot:
             if session.selected_subject:
                 # Reset topic selection
                 session.selected_topic = None
-                topics = self.notes_service.get_topics_for_subject(
+                topics = await self.notes_service.get_topics_for_subject(
                     session.selected_subject
                 )
                 keyboard = [[topic.name] for topic in topics]
@@ -402,8 +473,21 @@ class TelegramBot:
 
     def run_sync(self) -> None:
         """Run the telegram bot synchronously."""
+
+        async def post_init(application: Application) -> None:
+            await self.history_service.start()
+
+        async def post_shutdown(application: Application) -> None:
+            await self.history_service.stop()
+
         # Create application
-        application = Application.builder().token(self.token).build()
+        application = (
+            Application.builder()
+            .token(self.token)
+            .post_init(post_init)
+            .post_shutdown(post_shutdown)
+            .build()
+        )
 
         # Add handlers
         application.add_handler(CommandHandler("start", self.start_command))
@@ -31,6 +31,9 @@ class Question:
     source_paragraph: Paragraph
     topic: str
     subject: str
+    locale: str
+    asked_at: float = 0.0
+    generation_latency: float = 0.0
 
 
 @dataclass
@@ -41,3 +44,19 @@ class UserSession:
     selected_subject: Optional[str] = None
     score: int = 0
     questions_answered: int = 0
+
+
+@dataclass
+class AnswerEvent:
+    user_id: int
+    locale: str
+    subject: str
+    topic: str
+    file_path: str
+    paragraph_index: int
+    question: str
+    score: int
+    timestamp: float
+    generation_latency: float
+    answer_latency: float
+    scoring_latency: float
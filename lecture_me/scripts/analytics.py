@@ -0,0 +1,101 @@
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from omegaconf import DictConfig
+
+import hydra
+from lecture_me.services.history_service import SUMMARY_FILE_NAME
+from lecture_me.utils.common import get_config_path
+
+CONFIG_NAME = "config_main"
+MAX_SCORE = 3
+
+
+def iter_events(history_directory: Path) -> Iterator[Dict[str, Any]]:
+    """Iterate over all events stored in the JSONL segments."""
+    for segment_path in sorted(history_directory.glob("events-*.jsonl")):
+        with open(segment_path, "r", encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line of a segment may be cut if the bot was killed
+                    print(f"Skipping malformed line in {segment_path}")
+
+
+def summarize(totals: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    """Turn accumulated [count, score, latency] sums into summary statistics."""
+    summary = {}
+    for key, (count, score_sum, latency_sum) in totals.items():
+        average_score = score_sum / count
+        summary[key] = {
+            "questions_answered": int(count),
+            "average_score": round(average_score, 3),
+            "difficulty": round(1.0 - average_score / MAX_SCORE, 3),
+            "average_answer_latency": round(latency_sum / count, 3),
+        }
+    return summary
+
+
+def compute_summary(events: Iterator[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate events into per-topic and per-user difficulty in a single pass."""
+    topic_totals: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0, 0.0])
+    user_totals: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0, 0.0])
+    user_topic_totals: Dict[str, Dict[str, List[float]]] = defaultdict(
+        lambda: defaultdict(lambda: [0, 0.0, 0.0])
+    )
+
+    for event in events:
+        topic_key = f"{event['subject']}/{event['topic']}"
+        user_key = str(event["user_id"])
+        for totals in (
+            topic_totals[topic_key],
+            user_totals[user_key],
+            user_topic_totals[user_key][topic_key],
+        ):
+            totals[0] += 1
+            totals[1] += event["score"]
+            totals[2] += event["answer_latency"]
+
+    users = summarize(user_totals)
+    for user_key, user_summary in users.items():
+        user_summary["topics"] = summarize(user_topic_totals[user_key])
+
+    return {"topics": summarize(topic_totals), "users": users}
+
+
+def main(cfg: DictConfig) -> None:
+    """Compute history summaries used by the /stats command."""
+    history_directory = Path(cfg.history.directory)
+    print(f"History directory: {history_directory}")
+
+    if not history_directory.exists():
+        print("No history found, nothing to summarize")
+        return
+
+    summary = compute_summary(iter_events(history_directory))
+
+    # Write to a temporary file first so that the bot never reads a partial summary
+    summary_path = history_directory / SUMMARY_FILE_NAME
+    tmp_path = summary_path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(summary, file, ensure_ascii=False, indent=2)
+    tmp_path.replace(summary_path)
+
+    print(
+        f"Summarized {len(summary['topics'])} topics "
+        f"and {len(summary['users'])} users into {summary_path}"
+    )
+
+
+if __name__ == "__main__":
+    hydra.main(
+        config_path=str(get_config_path()),
+        config_name=CONFIG_NAME,
+        version_base="1.3",
+    )(main)()
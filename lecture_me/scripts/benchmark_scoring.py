@@ -0,0 +1,177 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, List, Tuple
+
+from hydra.utils import instantiate
+from omegaconf import DictConfig
+
+import hydra
+from lecture_me.models.data_models import Paragraph
+from lecture_me.services.llm_service import LLMService
+from lecture_me.services.notes_service import NotesService
+from lecture_me.services.prompt_registry import PromptRegistry
+from lecture_me.utils.common import get_config_path
+
+CONFIG_NAME = "config_benchmark_scoring"
+
+
+async def sample_paragraphs(notes_service: NotesService, n: int) -> List[Paragraph]:
+    """Sample paragraphs uniformly across all notes (reservoir sampling).
+
+    Paragraphs are consumed as they are streamed, so the notes are never held in
+    memory as a whole.
+    """
+    paragraphs: List[Paragraph] = []
+    paragraphs_seen = 0
+    for subject in await notes_service.get_subjects():
+        for topic in subject.topics:
+            async for paragraph in notes_service.iter_topic_paragraphs(
+                subject.name, topic.name
+            ):
+                paragraphs_seen += 1
+                if len(paragraphs) < n:
+                    paragraphs.append(paragraph)
+                else:
+                    i = random.randrange(paragraphs_seen)
+                    if i < n:
+                        paragraphs[i] = paragraph
+    random.shuffle(paragraphs)
+    return paragraphs
+
+
+def make_answers(paragraph: Paragraph, other: Paragraph) -> List[str]:
+    """Build full, partial and irrelevant answers to cover the whole score range."""
+    return [
+        paragraph.content,
+        paragraph.content[: len(paragraph.content) // 2],
+        other.content,
+    ]
+
+
+async def timed_score(coro: Awaitable[Tuple[int, str]]) -> Tuple[int, float]:
+    start_time = time.monotonic()
+    score, _ = await coro
+    return score, time.monotonic() - start_time
+
+
+async def run_benchmark(
+    notes_service: NotesService,
+    llm_service: LLMService,
+    num_paragraphs: int,
+    locale: str,
+) -> None:
+    assert llm_service.rubric_scoring_enabled(
+        locale
+    ), f"Rubric prompts must be configured for '{locale}'"
+    prompt_registry = llm_service.prompt_registry
+
+    paragraphs = await sample_paragraphs(notes_service, num_paragraphs)
+
+    paragraph_latencies: List[float] = []
+    rubric_latencies: List[float] = []
+    rubric_wait_latencies: List[float] = []
+    paragraph_prompt_chars: List[int] = []
+    rubric_prompt_chars: List[int] = []
+    score_pairs: List[Tuple[int, int]] = []
+
+    for i, paragraph in enumerate(paragraphs):
+        other = paragraphs[(i + 1) % len(paragraphs)]
+        # The rubric is built in the background while the question is generated
+        question = await llm_service.generate_question(paragraph, locale)
+
+        start_time = time.monotonic()
+        rubric = await llm_service.get_rubric(paragraph, locale)
+        rubric_wait_latencies.append(time.monotonic() - start_time)
+        if rubric is None:
+            print(f"Skipping paragraph from {paragraph.file_path.name}: no rubric")
+            continue
+
+        for answer in make_answers(paragraph, other):
+            paragraph_score, paragraph_latency = await timed_score(
+                llm_service.score_answer_with_paragraph(
+                    question, answer, paragraph, locale
+                )
+            )
+            rubric_score, rubric_latency = await timed_score(
+                llm_service.score_answer_with_rubric(question, answer, rubric, locale)
+            )
+
+            paragraph_latencies.append(paragraph_latency)
+            rubric_latencies.append(rubric_latency)
+            paragraph_prompt_chars.append(
+                len(
+                    prompt_registry.format(
+                        locale,
+                        "answer_scoring",
+                        paragraph=paragraph.content,
+                        question=question,
+                        user_answer=answer,
+                    )
+                )
+            )
+            rubric_prompt_chars.append(
+                len(
+                    prompt_registry.format(
+                        locale,
+                        "rubric_scoring",
+                        rubric=rubric,
+                        question=question,
+                        user_answer=answer,
+                    )
+                )
+            )
+            score_pairs.append((paragraph_score, rubric_score))
+
+    n = len(score_pairs)
+    if n == 0:
+        print("No paragraphs found, nothing to benchmark")
+        return
+
+    exact = sum(a == b for a, b in score_pairs) / n
+    within_one = sum(abs(a - b) <= 1 for a, b in score_pairs) / n
+    mean_abs_diff = sum(abs(a - b) for a, b in score_pairs) / n
+
+    print(f"Scored answers: {n}")
+    print(
+        f"Paragraph scoring: {sum(paragraph_latencies) / n:.2f} s/answer, "
+        f"{sum(paragraph_prompt_chars) / n:.0f} prompt chars/answer"
+    )
+    print(
+        f"Rubric scoring: {sum(rubric_latencies) / n:.2f} s/answer, "
+        f"{sum(rubric_prompt_chars) / n:.0f} prompt chars/answer"
+    )
+    print(
+        f"Waiting for rubric after question generation: "
+        f"{sum(rubric_wait_latencies) / len(rubric_wait_latencies):.2f} s/paragraph"
+    )
+    print(
+        f"Score agreement: exact {exact:.0%}, within 1 point {within_one:.0%}, "
+        f"mean absolute difference {mean_abs_diff:.2f}"
+    )
+
+
+def main(cfg: DictConfig) -> None:
+    """Compare paragraph-based and rubric-based scoring in latency and agreement."""
+    notes_service = NotesService(
+        cfg.notes_directory,
+        max_workers=cfg.notes_max_workers,
+        chunk_size=cfg.notes_read_chunk_size,
+    )
+    llm = instantiate(cfg.llm)
+    prompt_registry = PromptRegistry(
+        prompts=cfg.prompts, default_locale=cfg.default_locale
+    )
+    llm_service = LLMService(llm=llm, prompt_registry=prompt_registry)
+
+    asyncio.run(
+        run_benchmark(notes_service, llm_service, cfg.num_paragraphs, cfg.locale)
+    )
+
+
+if __name__ == "__main__":
+    hydra.main(
+        config_path=str(get_config_path()),
+        config_name=CONFIG_NAME,
+        version_base="1.3",
+    )(main)()
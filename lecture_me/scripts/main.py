@@ -3,8 +3,10 @@ from omegaconf import DictConfig
 
 import hydra
 from lecture_me.bot.telegram_bot import TelegramBot
+from lecture_me.services.history_service import HistoryService
 from lecture_me.services.llm_service import LLMService
 from lecture_me.services.notes_service import NotesService
+from lecture_me.services.prompt_registry import PromptRegistry
 from lecture_me.utils.common import get_config_path
 
 CONFIG_NAME = "config_main"
@@ -16,16 +18,28 @@ def main(cfg: DictConfig) -> None:
     print(f"Notes directory: {cfg.notes_directory}")
 
     # Initialize services
-    notes_service = NotesService(cfg.notes_directory)
+    notes_service = NotesService(
+        cfg.notes_directory,
+        max_workers=cfg.notes_max_workers,
+        chunk_size=cfg.notes_read_chunk_size,
+    )
     llm = instantiate(cfg.llm)
-    llm_service = LLMService(
-        llm=llm,
-        question_generation_prompt=cfg.question_generation_prompt,
-        answer_scoring_prompt=cfg.answer_scoring_prompt,
+    prompt_registry = PromptRegistry(
+        prompts=cfg.prompts, default_locale=cfg.default_locale
+    )
+    llm_service = LLMService(llm=llm, prompt_registry=prompt_registry)
+
+    history_service = HistoryService(
+        history_directory=cfg.history.directory,
+        batch_size=cfg.history.batch_size,
+        flush_interval=cfg.history.flush_interval,
+        max_segment_events=cfg.history.max_segment_events,
     )
 
     # Initialize and run the bot (this will handle its own event loop)
-    bot = TelegramBot(cfg.telegram_bot_token, notes_service, llm_service)
+    bot = TelegramBot(
+        cfg.telegram_bot_token, notes_service, llm_service, history_service
+    )
     bot.run_sync()
 
 
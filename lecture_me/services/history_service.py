@@ -0,0 +1,145 @@
+import asyncio
+import json
+import logging
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from lecture_me.models.data_models import AnswerEvent
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_FILE_NAME = "summary.json"
+
+
+class HistoryService:
+    """Append-only log of Q/A events stored as JSONL segments.
+
+    Handlers only enqueue events. A background task drains the queue in batches
+    and appends them to the current segment in a worker thread, so file I/O never
+    runs on the event loop.
+    """
+
+    def __init__(
+        self,
+        history_directory: str,
+        batch_size: int = 64,
+        flush_interval: float = 5.0,
+        max_segment_events: int = 10000,
+        max_queue_size: int = 10000,
+    ):
+        self.history_directory = Path(history_directory)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_segment_events = max_segment_events
+        # None is put on the queue as a sentinel that stops the writer
+        self._queue: asyncio.Queue[Optional[AnswerEvent]] = asyncio.Queue(
+            maxsize=max_queue_size
+        )
+        self._writer_task: Optional[asyncio.Task[None]] = None
+        self._segment_path: Optional[Path] = None
+        self._segment_events = 0
+        self._summary: Dict[str, Any] = {}
+        self._summary_mtime: Optional[float] = None
+
+    def record(self, event: AnswerEvent) -> None:
+        """Enqueue an event without waiting for it to be written."""
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("History queue is full, dropping event")
+
+    async def start(self) -> None:
+        """Start the background writer."""
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def stop(self) -> None:
+        """Stop the background writer and flush whatever is still queued."""
+        if self._writer_task is not None:
+            # The writer flushes the batch it holds before it returns
+            await self._queue.put(None)
+            await self._writer_task
+            self._writer_task = None
+        await self._flush(self._drain())
+
+    async def _writer_loop(self) -> None:
+        while True:
+            event = await self._queue.get()
+            if event is None:
+                return
+
+            batch = [event]
+            stopping = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+                if event is None:
+                    stopping = True
+                    break
+                batch.append(event)
+
+            await self._flush(batch)
+            if stopping:
+                return
+
+    def _drain(self) -> List[AnswerEvent]:
+        batch = []
+        while not self._queue.empty():
+            event = self._queue.get_nowait()
+            if event is not None:
+                batch.append(event)
+        return batch
+
+    async def _flush(self, batch: List[AnswerEvent]) -> None:
+        if not batch:
+            return
+        try:
+            await asyncio.to_thread(self._write_batch, batch)
+        except Exception as e:
+            logger.error(f"Error writing history batch: {e}")
+
+    def _write_batch(self, batch: List[AnswerEvent]) -> None:
+        self.history_directory.mkdir(parents=True, exist_ok=True)
+        lines = "".join(
+            json.dumps(asdict(event), ensure_ascii=False) + "\n" for event in batch
+        )
+        if (
+            self._segment_path is None
+            or self._segment_events >= self.max_segment_events
+        ):
+            self._segment_path = (
+                self.history_directory / f"events-{time.time_ns()}.jsonl"
+            )
+            self._segment_events = 0
+        with open(self._segment_path, "a", encoding="utf-8") as file:
+            file.write(lines)
+        self._segment_events += len(batch)
+
+    async def get_user_summary(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Get the precomputed analytics summary for a user, if available."""
+        summary = await asyncio.to_thread(self._load_summary)
+        return summary.get("users", {}).get(str(user_id))
+
+    def _load_summary(self) -> Dict[str, Any]:
+        """Read the summary file produced by the analytics script when it changes."""
+        summary_path = self.history_directory / SUMMARY_FILE_NAME
+        try:
+            mtime = summary_path.stat().st_mtime
+        except FileNotFoundError:
+            return {}
+        if mtime != self._summary_mtime:
+            try:
+                with open(summary_path, "r", encoding="utf-8") as file:
+                    self._summary = json.load(file)
+                self._summary_mtime = mtime
+            except Exception as e:
+                logger.error(f"Error reading history summary {summary_path}: {e}")
+        return self._summary
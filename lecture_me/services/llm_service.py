@@ -1,31 +1,45 @@
+import asyncio
 import json
-from typing import Tuple
+import logging
+from collections import OrderedDict
+from functools import partial
+from typing import Optional, Tuple
 
 from rally.interaction import LlmMessage, request_based_on_message_history
 from rally.llm import Llm
 
 from lecture_me.models.data_models import Paragraph
+from lecture_me.services.prompt_registry import PromptRegistry
+
+logger = logging.getLogger(__name__)
+
+RubricKey = Tuple[str, str, int, int]
 
 
 class LLMService:
     def __init__(
-        self, llm: Llm, question_generation_prompt: str, answer_scoring_prompt: str
+        self,
+        llm: Llm,
+        prompt_registry: PromptRegistry,
+        rubric_cache_size: int = 1024,
     ):
         self.llm = llm
-        self.question_generation_prompt = question_generation_prompt
-        self.answer_scoring_prompt = answer_scoring_prompt
-
-    async def generate_question(self, paragraph: Paragraph) -> str:
-        messages: list[LlmMessage] = [
-            {
-                "role": "user",
-                "content": self.question_generation_prompt.format(
-                    paragraph=paragraph.content
-                ),
-            }
-        ]
-
-        assistant_message = request_based_on_message_history(
+        self.prompt_registry = prompt_registry
+        self.rubric_cache_size = rubric_cache_size
+        self._rubrics: OrderedDict[RubricKey, asyncio.Task[str]] = OrderedDict()
+
+    def rubric_scoring_enabled(self, locale: str) -> bool:
+        return (
+            self.prompt_registry.get(locale, "rubric_generation") is not None
+            and self.prompt_registry.get(locale, "rubric_scoring") is not None
+        )
+
+    async def _request(self, content: str) -> str:
+        """Send a single user message to the LLM without blocking the event loop."""
+        messages: list[LlmMessage] = [{"role": "user", "content": content}]
+
+        assistant_message = await asyncio.to_thread(
+            request_based_on_message_history,
             llm_server_url=self.llm.url,
             message_history=messages,
             authorization=self.llm.authorization,
@@ -34,30 +48,84 @@ class LLMService:
 
         return assistant_message["content"]
 
+    async def generate_question(self, paragraph: Paragraph, locale: str) -> str:
+        # Build the rubric concurrently so that it is ready once the user answers
+        if self.rubric_scoring_enabled(locale):
+            self.prepare_rubric(paragraph, locale)
+
+        return await self._request(
+            self.prompt_registry.format(
+                locale, "question_generation", paragraph=paragraph.content
+            )
+        )
+
+    def prepare_rubric(self, paragraph: Paragraph, locale: str) -> None:
+        """Start building the key-points rubric for a paragraph in the background."""
+        key = self._rubric_key(paragraph, locale)
+        if key in self._rubrics:
+            self._rubrics.move_to_end(key)
+            return
+
+        task = asyncio.create_task(self.generate_rubric(paragraph, locale))
+        # Failures are handled even if no scoring call ever awaits the task
+        task.add_done_callback(partial(self._on_rubric_done, key))
+        self._rubrics[key] = task
+        while len(self._rubrics) > self.rubric_cache_size:
+            # Evicted tasks are not cancelled since a scoring call may await them
+            self._rubrics.popitem(last=False)
+
+    async def generate_rubric(self, paragraph: Paragraph, locale: str) -> str:
+        return await self._request(
+            self.prompt_registry.format(
+                locale, "rubric_generation", paragraph=paragraph.content
+            )
+        )
+
+    async def get_rubric(self, paragraph: Paragraph, locale: str) -> Optional[str]:
+        """Wait for the cached rubric of a paragraph if it has been requested."""
+        key = self._rubric_key(paragraph, locale)
+        task = self._rubrics.get(key)
+        if task is None:
+            return None
+
+        try:
+            return await task
+        except Exception:
+            # Already logged in _on_rubric_done
+            return None
+
+    def _on_rubric_done(self, key: RubricKey, task: asyncio.Task[str]) -> None:
+        if task.cancelled():
+            return
+
+        e = task.exception()
+        if e is not None:
+            logger.error(f"Error generating rubric: {e}")
+            # Drop the failed task so that the next question retries
+            if self._rubrics.get(key) is task:
+                del self._rubrics[key]
+
     async def score_answer(
-        self, question: str, user_answer: str, reference_paragraph: Paragraph
+        self,
+        question: str,
+        user_answer: str,
+        reference_paragraph: Paragraph,
+        locale: str,
     ) -> Tuple[int, str]:
-        messages: list[LlmMessage] = [
-            {
-                "role": "user",
-                "content": self.answer_scoring_prompt.format(
-                    paragraph=reference_paragraph.content,
-                    question=question,
-                    user_answer=user_answer,
-                ),
-            }
-        ]
-
-        assistant_message = request_based_on_message_history(
-            llm_server_url=self.llm.url,
-            message_history=messages,
-            authorization=self.llm.authorization,
-            model=self.llm.model,
-        )
+        rubric = None
+        if self.rubric_scoring_enabled(locale):
+            rubric = await self.get_rubric(reference_paragraph, locale)
 
-        resp_dict = json.loads(assistant_message["content"])
-        score = int(resp_dict["score"])
-        feedback = resp_dict["explanation"]
+        if rubric is not None:
+            score, explanation = await self.score_answer_with_rubric(
+                question, user_answer, rubric, locale
+            )
+        else:
+            score, explanation = await self.score_answer_with_paragraph(
+                question, user_answer, reference_paragraph, locale
+            )
+
+        feedback = explanation
         feedback += "\n\n"
         feedback += (
             f"Original paragraph from note {reference_paragraph.file_path.name}:\n"
@@ -65,3 +133,53 @@ class LLMService:
         )
 
         return score, feedback
+
+    async def score_answer_with_paragraph(
+        self,
+        question: str,
+        user_answer: str,
+        reference_paragraph: Paragraph,
+        locale: str,
+    ) -> Tuple[int, str]:
+        content = await self._request(
+            self.prompt_registry.format(
+                locale,
+                "answer_scoring",
+                paragraph=reference_paragraph.content,
+                question=question,
+                user_answer=user_answer,
+            )
+        )
+
+        return self._parse_score(content)
+
+    async def score_answer_with_rubric(
+        self, question: str, user_answer: str, rubric: str, locale: str
+    ) -> Tuple[int, str]:
+        content = await self._request(
+            self.prompt_registry.format(
+                locale,
+                "rubric_scoring",
+                rubric=rubric,
+                question=question,
+                user_answer=user_answer,
+            )
+        )
+
+        return self._parse_score(content)
+
+    @staticmethod
+    def _parse_score(content: str) -> Tuple[int, str]:
+        resp_dict = json.loads(content)
+        score = int(resp_dict["score"])
+        explanation = resp_dict["explanation"]
+        return score, explanation
+
+    @staticmethod
+    def _rubric_key(paragraph: Paragraph, locale: str) -> RubricKey:
+        return (
+            locale,
+            str(paragraph.file_path),
+            paragraph.paragraph_index,
+            hash(paragraph.content),
+        )
@@ -1,32 +1,68 @@
+import asyncio
 import random
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import (AsyncIterator, Callable, Dict, List, Optional, Tuple,
+                    TypeVar)
+
+import aiofiles
 
 from lecture_me.models.data_models import Paragraph, Subject, Topic
 
+T = TypeVar("T")
+
+PARAGRAPH_SEPARATOR = "\n\n"
+
 
 class NotesService:
-    def __init__(self, notes_directory: str):
+    def __init__(
+        self, notes_directory: str, max_workers: int = 8, chunk_size: int = 64 * 1024
+    ):
         self.notes_directory = Path(notes_directory)
+        self.chunk_size = chunk_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="notes"
+        )
+        # Bounds the number of files streamed at the same time
+        self._read_semaphore = asyncio.Semaphore(max_workers)
+        # Markdown files per topic directory keyed by the directory mtime
+        self._markdown_files_cache: Dict[Path, Tuple[float, List[Path]]] = {}
+
+    async def _run(self, func: Callable[..., T], *args: object) -> T:
+        """Run blocking filesystem work in the notes thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
 
-    def get_subjects(self) -> List[Subject]:
+    async def get_subjects(self) -> List[Subject]:
         """Get all subjects from the notes directory."""
+        subject_dirs = await self._run(self._get_subject_dirs)
+
+        # Scan subjects concurrently, the thread pool bounds the concurrency
+        topics_per_subject = await asyncio.gather(
+            *(self._run(self._get_topics_for_subject, d) for d in subject_dirs)
+        )
+
         subjects: list[Subject] = []
+        for subject_dir, topics in zip(subject_dirs, topics_per_subject):
+            if topics:  # Only include subjects that have topics with markdown files
+                subject = Subject(
+                    name=subject_dir.name, path=subject_dir, topics=topics
+                )
+                subjects.append(subject)
+
+        return subjects
 
+    def _get_subject_dirs(self) -> List[Path]:
+        """Get all subject directories in the notes directory."""
         if not self.notes_directory.exists():
-            return subjects
-
-        for subject_dir in self.notes_directory.iterdir():
-            if subject_dir.is_dir() and not subject_dir.name.startswith("."):
-                topics = self._get_topics_for_subject(subject_dir)
-                if topics:  # Only include subjects that have topics with markdown files
-                    subject = Subject(
-                        name=subject_dir.name, path=subject_dir, topics=topics
-                    )
-                    subjects.append(subject)
+            return []
 
-        return subjects
+        return [
+            subject_dir
+            for subject_dir in self.notes_directory.iterdir()
+            if subject_dir.is_dir() and not subject_dir.name.startswith(".")
+        ]
 
     def _get_topics_for_subject(self, subject_dir: Path) -> List[Topic]:
         """Get all topics for a given subject."""
@@ -47,7 +83,16 @@ class NotesService:
         return topics
 
     def _get_markdown_files(self, topic_dir: Path) -> List[Path]:
-        """Get all markdown files in a topic directory."""
+        """Get all markdown files in a topic directory.
+
+        The directory is only listed again if its mtime has changed since the last
+        scan, i.e. a file was added, removed or renamed.
+        """
+        mtime = topic_dir.stat().st_mtime
+        cached = self._markdown_files_cache.get(topic_dir)
+        if cached is not None and cached[0] == mtime:
+            return list(cached[1])
+
         markdown_files = []
 
         for file_path in topic_dir.iterdir():
@@ -58,28 +103,33 @@ class NotesService:
             ):
                 markdown_files.append(file_path)
 
-        return markdown_files
+        self._markdown_files_cache[topic_dir] = (mtime, markdown_files)
+        return list(markdown_files)
 
-    def get_topics_for_subject(self, subject_name: str) -> List[Topic]:
+    async def get_topics_for_subject(self, subject_name: str) -> List[Topic]:
         """Get all topics for a specific subject."""
-        subjects = self.get_subjects()
-        for subject in subjects:
-            if subject.name == subject_name:
-                return subject.topics
-        return []
+        subject_dir = self.notes_directory / subject_name
+        if (
+            subject_dir.name.startswith(".")
+            or subject_dir.parent != self.notes_directory
+        ):
+            return []
+        if not await self._run(subject_dir.is_dir):
+            return []
+        return await self._run(self._get_topics_for_subject, subject_dir)
 
-    def get_random_paragraph(
+    async def _get_topic(self, subject_name: str, topic_name: str) -> Optional[Topic]:
+        topics = await self.get_topics_for_subject(subject_name)
+        for topic in topics:
+            if topic.name == topic_name:
+                return topic
+        return None
+
+    async def get_random_paragraph(
         self, subject_name: str, topic_name: str
     ) -> Optional[Paragraph]:
         """Get a random paragraph from a random markdown file in the specified topic."""
-        topics = self.get_topics_for_subject(subject_name)
-
-        # Find the specified topic
-        target_topic = None
-        for topic in topics:
-            if topic.name == topic_name:
-                target_topic = topic
-                break
+        target_topic = await self._get_topic(subject_name, topic_name)
 
         if not target_topic or not target_topic.markdown_files:
             return None
@@ -87,52 +137,105 @@ class NotesService:
         # Select a random markdown file
         random_file = random.choice(target_topic.markdown_files)
 
-        # Extract paragraphs from the file
-        paragraphs = self._extract_paragraphs(random_file)
+        # Select a random paragraph while streaming the file (reservoir sampling)
+        random_paragraph = None
+        paragraphs_seen = 0
+        async for paragraph in self.iter_paragraphs(random_file):
+            paragraphs_seen += 1
+            if random.randrange(paragraphs_seen) == 0:
+                random_paragraph = paragraph
 
-        if not paragraphs:
-            return None
+        return random_paragraph
 
-        # Select a random paragraph
-        random_paragraph_content, paragraph_index = random.choice(paragraphs)
+    async def iter_topic_paragraphs(
+        self, subject_name: str, topic_name: str
+    ) -> AsyncIterator[Paragraph]:
+        """Yield paragraphs of all markdown files in a topic as soon as they are parsed.
 
-        return Paragraph(
-            content=random_paragraph_content,
-            file_path=random_file,
-            paragraph_index=paragraph_index,
-        )
+        Files are read concurrently, so paragraphs of different files may interleave.
+        """
+        target_topic = await self._get_topic(subject_name, topic_name)
 
-    def _extract_paragraphs(self, file_path: Path) -> List[Tuple[str, int]]:
-        """Extract paragraphs from a markdown file."""
-        try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                content = file.read()
-        except Exception as e:
-            print(f"Error reading file {file_path}: {e}")
-            return []
+        if not target_topic:
+            return
 
-        # Split content into paragraphs (separated by double newlines)
-        paragraphs = []
-        raw_paragraphs = content.split("\n\n")
+        queue: asyncio.Queue[Optional[Paragraph]] = asyncio.Queue(maxsize=256)
 
-        for i, paragraph in enumerate(raw_paragraphs):
-            # Clean up the paragraph
-            cleaned = paragraph.strip()
-
-            # Skip empty paragraphs, headers, and very short paragraphs
-            if (
-                len(cleaned) > 50
-                and not cleaned.startswith("#")
-                and not cleaned.startswith("```")
-                and not cleaned.startswith("---")
-            ):
+        async def produce(file_path: Path) -> None:
+            # Read errors are handled in _extract_paragraphs, so None always arrives
+            async for paragraph in self.iter_paragraphs(file_path):
+                await queue.put(paragraph)
+            await queue.put(None)
 
-                # Remove markdown formatting for cleaner text
-                cleaned = re.sub(r"\*\*(.*?)\*\*", r"\1", cleaned)  # Bold
-                cleaned = re.sub(r"\*(.*?)\*", r"\1", cleaned)  # Italic
-                cleaned = re.sub(r"`(.*?)`", r"\1", cleaned)  # Inline code
-                cleaned = re.sub(r"\[(.*?)\]\(.*?\)", r"\1", cleaned)  # Links
+        producers = [
+            asyncio.create_task(produce(file_path))
+            for file_path in target_topic.markdown_files
+        ]
+        try:
+            remaining = len(producers)
+            while remaining:
+                paragraph = await queue.get()
+                if paragraph is None:
+                    remaining -= 1
+                else:
+                    yield paragraph
+        finally:
+            for producer in producers:
+                producer.cancel()
+
+    async def iter_paragraphs(self, file_path: Path) -> AsyncIterator[Paragraph]:
+        """Stream paragraphs from a markdown file without reading it whole."""
+        async for content, paragraph_index in self._extract_paragraphs(file_path):
+            yield Paragraph(
+                content=content, file_path=file_path, paragraph_index=paragraph_index
+            )
+
+    async def _extract_paragraphs(
+        self, file_path: Path
+    ) -> AsyncIterator[Tuple[str, int]]:
+        """Extract paragraphs from a markdown file."""
+        async with self._read_semaphore:
+            try:
+                async with aiofiles.open(
+                    file_path, "r", encoding="utf-8", executor=self._executor
+                ) as file:
+                    # Split content into paragraphs (separated by double newlines).
+                    # The tail after the last separator may continue in the next chunk
+                    buffer = ""
+                    i = 0
+                    while chunk := await file.read(self.chunk_size):
+                        buffer += chunk
+                        *raw_paragraphs, buffer = buffer.split(PARAGRAPH_SEPARATOR)
+                        for paragraph in raw_paragraphs:
+                            cleaned = self._clean_paragraph(paragraph)
+                            if cleaned is not None:
+                                yield cleaned, i
+                            i += 1
+
+                    cleaned = self._clean_paragraph(buffer)
+                    if cleaned is not None:
+                        yield cleaned, i
+            except Exception as e:
+                print(f"Error reading file {file_path}: {e}")
+
+    @staticmethod
+    def _clean_paragraph(paragraph: str) -> Optional[str]:
+        """Clean up a raw paragraph or return None if it should be skipped."""
+        cleaned = paragraph.strip()
+
+        # Skip empty paragraphs, headers, and very short paragraphs
+        if (
+            len(cleaned) <= 50
+            or cleaned.startswith("#")
+            or cleaned.startswith("```")
+            or cleaned.startswith("---")
+        ):
+            return None
 
-                paragraphs.append((cleaned, i))
+        # Remove markdown formatting for cleaner text
+        cleaned = re.sub(r"\*\*(.*?)\*\*", r"\1", cleaned)  # Bold
+        cleaned = re.sub(r"\*(.*?)\*", r"\1", cleaned)  # Italic
+        cleaned = re.sub(r"`(.*?)`", r"\1", cleaned)  # Inline code
+        cleaned = re.sub(r"\[(.*?)\]\(.*?\)", r"\1", cleaned)  # Links
 
-        return paragraphs
+        return cleaned
@@ -0,0 +1,87 @@
+from string import Formatter
+from typing import Dict, List, Mapping, Optional, Tuple
+
+# Placeholders each task is allowed to use
+TASK_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "question_generation": ("paragraph",),
+    "answer_scoring": ("paragraph", "question", "user_answer"),
+    "rubric_generation": ("paragraph",),
+    "rubric_scoring": ("rubric", "question", "user_answer"),
+}
+
+
+class PromptTemplate:
+    """A prompt template parsed once into literal text and placeholders.
+
+    Rendering only joins the precomputed pieces instead of parsing the template
+    again on each call.
+    """
+
+    def __init__(self, template: str, allowed_fields: Tuple[str, ...]):
+        self._parts: List[Tuple[str, Optional[str]]] = []
+
+        for literal, field, format_spec, conversion in Formatter().parse(template):
+            if field is not None:
+                if field not in allowed_fields or format_spec or conversion:
+                    raise ValueError(
+                        f"Unsupported placeholder {{{field}}} in prompt template, "
+                        f"expected one of: {', '.join(allowed_fields)}"
+                    )
+            self._parts.append((literal, field))
+
+    def format(self, **kwargs: str) -> str:
+        return "".join(
+            literal + (kwargs[field] if field is not None else "")
+            for literal, field in self._parts
+        )
+
+
+class PromptRegistry:
+    """Prompt templates per locale and task."""
+
+    def __init__(
+        self,
+        prompts: Mapping[str, Mapping[str, Optional[str]]],
+        default_locale: str,
+    ):
+        if default_locale not in prompts:
+            raise ValueError(f"No prompts found for default locale '{default_locale}'")
+
+        self.default_locale = default_locale
+        self._templates: Dict[Tuple[str, str], PromptTemplate] = {}
+
+        for locale, locale_prompts in prompts.items():
+            for task, template in locale_prompts.items():
+                if task not in TASK_FIELDS:
+                    raise ValueError(f"Unknown prompt task '{task}' for '{locale}'")
+                if template is not None:
+                    self._templates[(locale, task)] = PromptTemplate(
+                        template, TASK_FIELDS[task]
+                    )
+
+        self.locales = set(prompts.keys())
+        for locale in self.locales:
+            for task in ("question_generation", "answer_scoring"):
+                if (locale, task) not in self._templates:
+                    raise ValueError(f"Missing '{task}' prompt for '{locale}'")
+
+    def resolve_locale(self, language_code: Optional[str]) -> str:
+        """Map a Telegram language code (e.g. "en-US") to a supported locale."""
+        if language_code:
+            language_code = language_code.lower().replace("_", "-")
+            if language_code in self.locales:
+                return language_code
+            language = language_code.split("-")[0]
+            if language in self.locales:
+                return language
+        return self.default_locale
+
+    def get(self, locale: str, task: str) -> Optional[PromptTemplate]:
+        """Get the template of a task for a supported locale, if it is configured."""
+        return self._templates.get((locale, task))
+
+    def format(self, locale: str, task: str, **kwargs: str) -> str:
+        template = self.get(locale, task)
+        if template is None:
+            raise KeyError(f"No '{task}' prompt for locale '{locale}'")
+        return template.format(**kwargs)